@@ -79,10 +79,22 @@ client = OpenAI(api_key=GROQ_API_KEY, base_url=GROQ_API_BASE)
 
 # --- Import local modules ---
 from src.ingestion import extract_text_from_url, extract_text_from_pdf, save_uploaded_file
-from src.detection import detect_language
+from src.detection import detect_language, LANG_NAME_MAP
 from src.summarization import summarize_text
 from src.sentiment import classify_sentiment_with_groq
 from src.translation import auto_translate_to_english, translate
+from src.storage import AnalysisStore, content_hash
+
+# --- Persistent analysis store ---
+@st.cache_resource
+def get_store() -> AnalysisStore:
+    return AnalysisStore()
+
+try:
+    store = get_store()
+except Exception as e:
+    st.warning(f"Analysis store unavailable, results won't be cached: {e}")
+    store = None
 
 # --- Fetch available models ---
 @st.cache_data(ttl=300)
@@ -151,6 +163,7 @@ with left:
     st.header("Input")
     url_input = st.text_input("Paste URL (optional)")
     uploaded_file = st.file_uploader("Or upload a PDF/TXT", type=["pdf", "txt"])
+    rerun_analysis = st.checkbox("Re-run analysis (ignore stored result)", disabled=store is None)
     run = st.button("🚀 Run Analysis", use_container_width=True)
 
     st.markdown("---")
@@ -184,82 +197,176 @@ def run_full_analysis(text: str, model: str, max_chars: int, target_lang: str):
         out["translation_error"] = str(e)
     return out
 
+# --- Results presentation ---
+def render_results(results: dict):
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+    # Top row: detection + sentiment in two cards
+    c1, c2 = st.columns(2)
+
+    with c1:
+        det = results.get("detection", {})
+        st.markdown("### 🔎 Language Detection")
+        st.markdown(
+            f"<p class='muted'>Code: {det.get('lang')} — {det.get('name')} — score: {det.get('score'):.3f}</p>",
+            unsafe_allow_html=True,
+        )
+
+    with c2:
+        st.markdown("### 😊 Sentiment")
+        if "sentiment" in results:
+            sent = results["sentiment"]
+            st.json(sent)
+        else:
+            st.warning(f"Sentiment error: {results.get('sentiment_error')}")
+
+    # Summary
+    if "summary" in results:
+        st.markdown("<hr/>", unsafe_allow_html=True)
+        st.markdown("### 📝 Summary")
+        st.write(results["summary"])
+    else:
+        if "summary_error" in results:
+            st.warning(f"Summary error: {results['summary_error']}")
+
+    # Translation
+    st.markdown("<hr/>", unsafe_allow_html=True)
+    st.markdown("### 🌐 Translation")
+    trans = results.get("translation")
+    if trans:
+        st.write(trans[:4000])
+    else:
+        if "translation_error" in results:
+            st.warning(f"Translation error: {results['translation_error']}")
+        else:
+            st.info("No translation produced.")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
 # --- When run ---
 if run:
     status_box.info("📥 Extracting text...")
     text_content = ""
+    stored = None
+
+    use_store = store is not None and not rerun_analysis
+
+    # Already-analysed URLs are served straight from the store, skipping the fetch
+    if use_store and uploaded_file is None and url_input:
+        try:
+            stored = store.get_by_url(url_input, target_lang, model=model_choice)
+        except Exception as e:
+            st.warning(f"Could not read analysis store, running a fresh analysis: {e}")
+            use_store = False
 
     # Ingestion
-    try:
-        if uploaded_file is not None:
-            if uploaded_file.name.lower().endswith(".pdf"):
-                tmp = save_uploaded_file(uploaded_file)
-                text_content = extract_text_from_pdf(tmp)
+    if stored is None:
+        try:
+            if uploaded_file is not None:
+                if uploaded_file.name.lower().endswith(".pdf"):
+                    tmp = save_uploaded_file(uploaded_file)
+                    text_content = extract_text_from_pdf(tmp)
+                else:
+                    text_content = uploaded_file.read().decode("utf-8")
+            elif url_input:
+                text_content = extract_text_from_url(url_input)
             else:
-                text_content = uploaded_file.read().decode("utf-8")
-        elif url_input:
-            text_content = extract_text_from_url(url_input)
-        else:
-            st.error("Please upload a file or paste a URL.")
+                st.error("Please upload a file or paste a URL.")
+                st.stop()
+        except Exception as e:
+            st.error(f"Error during ingestion: {e}")
             st.stop()
-    except Exception as e:
-        st.error(f"Error during ingestion: {e}")
-        st.stop()
 
-    if not text_content or len(text_content.strip()) < 20:
-        st.error("No substantial text found.")
-        st.stop()
+        if not text_content or len(text_content.strip()) < 20:
+            st.error("No substantial text found.")
+            st.stop()
 
-    status_box.info("🔎 Running detection, summarization, sentiment, translation...")
-    with st.spinner("Running model analysis ..."):
-        results = run_full_analysis(text_content, model_choice, max_summary_chars, target_lang)
+        # Same content seen before (e.g. re-uploaded file or mirrored URL)
+        if use_store:
+            try:
+                stored = store.get_by_hash(content_hash(text_content), target_lang, model=model_choice)
+                if stored is not None and url_input and uploaded_file is None:
+                    store.add_url(url_input, stored["content_hash"], target_lang, model=model_choice)
+            except Exception as e:
+                st.warning(f"Could not read analysis store, running a fresh analysis: {e}")
+                stored = None
+
+    if stored is not None:
+        text_content = stored["text"]
+        results = stored["results"]
+        status_box.info(
+            f"🗄️ Loaded from analysis store — {stored['model']}, {stored['created_at']}. "
+            "Tick \"Re-run analysis\" to refresh."
+        )
+    else:
+        status_box.info("🔎 Running detection, summarization, sentiment, translation...")
+        with st.spinner("Running model analysis ..."):
+            results = run_full_analysis(text_content, model_choice, max_summary_chars, target_lang)
+
+        # Only cache complete runs so failed steps are retried next time
+        if store is not None and not any(k.endswith("_error") for k in results):
+            try:
+                source_url = url_input if uploaded_file is None and url_input else None
+                store.save(text_content, results, target_lang, model=model_choice, url=source_url)
+            except Exception as e:
+                st.warning(f"Could not save analysis: {e}")
 
     # --- Present results ---
     with results_area.container():
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-
-        # Top row: detection + sentiment in two cards
-        c1, c2 = st.columns(2)
-
-        with c1:
-            det = results.get("detection", {})
-            st.markdown("### 🔎 Language Detection")
-            st.markdown(
-                f"<p class='muted'>Code: {det.get('lang')} — {det.get('name')} — score: {det.get('score'):.3f}</p>",
-                unsafe_allow_html=True,
-            )
-
-        with c2:
-            st.markdown("### 😊 Sentiment")
-            if "sentiment" in results:
-                sent = results["sentiment"]
-                st.json(sent)
-            else:
-                st.warning(f"Sentiment error: {results.get('sentiment_error')}")
+        render_results(results)
 
-        # Summary
-        if "summary" in results:
-            st.markdown("<hr/>", unsafe_allow_html=True)
-            st.markdown("### 📝 Summary")
-            st.write(results["summary"])
-        else:
-            if "summary_error" in results:
-                st.warning(f"Summary error: {results['summary_error']}")
+    if stored is None:
+        status_box.success("✅ Analysis complete.")
+    with st.expander("Show full original text"):
+        st.text_area("Full text", text_content[:100000], height=300)
 
-        # Translation
-        st.markdown("<hr/>", unsafe_allow_html=True)
-        st.markdown("### 🌐 Translation")
-        trans = results.get("translation")
-        if trans:
-            st.write(trans[:4000])
-        else:
-            if "translation_error" in results:
-                st.warning(f"Translation error: {results['translation_error']}")
-            else:
-                st.info("No translation produced.")
+# --- Past analyses ---
+HISTORY_PAGE_SIZE = 10
 
-        st.markdown("</div>", unsafe_allow_html=True)
+if store is not None:
+    st.markdown("<hr/>", unsafe_allow_html=True)
+    st.header("Past Analyses")
 
-    status_box.success("✅ Analysis complete.")
-    with st.expander("Show full original text"):
-        st.text_area("Full text", text_content[:100000], height=300)
+    try:
+        facets = store.facets()
+    except Exception as e:
+        st.warning(f"Past analyses unavailable: {e}")
+        facets = None
+
+if store is not None and facets is not None:
+    h1, h2, h3 = st.columns([3, 1, 1])
+    with h1:
+        history_query = st.text_input("Search past articles")
+    with h2:
+        history_lang = st.selectbox(
+            "Language", ["All"] + facets["lang"],
+            format_func=lambda c: c if c == "All" else f"{c} — {LANG_NAME_MAP.get(c, c)}",
+        )
+    with h3:
+        history_sentiment = st.selectbox("Sentiment", ["All"] + facets["sentiment"])
+
+    history_filters = {
+        "query": history_query,
+        "lang": None if history_lang == "All" else history_lang,
+        "sentiment": None if history_sentiment == "All" else history_sentiment,
+    }
+    history = None
+    try:
+        total_matches = store.count(**history_filters)
+        total_pages = max(1, -(-total_matches // HISTORY_PAGE_SIZE))
+        page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, step=1)
+        history = store.search(**history_filters, limit=HISTORY_PAGE_SIZE, offset=(page - 1) * HISTORY_PAGE_SIZE)
+    except Exception as e:
+        st.warning(f"Past analyses unavailable: {e}")
+
+    if history is not None:
+        st.markdown(f"<p class='muted'>{total_matches} stored analyses match.</p>", unsafe_allow_html=True)
+
+        for item in history:
+            det = item["results"].get("detection", {})
+            sent = item["results"].get("sentiment") or {}
+            label = item["url"] or f"Uploaded text ({item['content_hash'][:8]})"
+            with st.expander(f"{label} — {det.get('lang')} — {sent.get('label', 'n/a')} — {item['model']} — {item['created_at']}"):
+                if item["snippet"]:
+                    st.markdown(item["snippet"])
+                render_results(item["results"])
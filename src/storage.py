@@ -0,0 +1,314 @@
+# src/storage.py
+import os
+import json
+import hashlib
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB_PATH = os.getenv("NLP_CCP_DB_PATH", "analyses.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    model TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    lang TEXT,
+    lang_name TEXT,
+    lang_score REAL,
+    summary TEXT,
+    sentiment_label TEXT,
+    sentiment_json TEXT,
+    translation TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE (content_hash, target_lang, model)
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_lang ON analyses (lang);
+CREATE INDEX IF NOT EXISTS idx_analyses_sentiment ON analyses (sentiment_label);
+
+-- Many URLs (mirrors, query-string variants) can serve the same analysed content.
+CREATE TABLE IF NOT EXISTS analysis_urls (
+    url TEXT NOT NULL,
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,
+    PRIMARY KEY (url, analysis_id)
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_urls_analysis ON analysis_urls (analysis_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts USING fts5 (
+    text, summary, translation,
+    content='analyses', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS analyses_ai AFTER INSERT ON analyses BEGIN
+    INSERT INTO analyses_fts (rowid, text, summary, translation)
+    VALUES (new.id, new.text, new.summary, new.translation);
+END;
+CREATE TRIGGER IF NOT EXISTS analyses_ad AFTER DELETE ON analyses BEGIN
+    INSERT INTO analyses_fts (analyses_fts, rowid, text, summary, translation)
+    VALUES ('delete', old.id, old.text, old.summary, old.translation);
+END;
+CREATE TRIGGER IF NOT EXISTS analyses_au AFTER UPDATE ON analyses BEGIN
+    INSERT INTO analyses_fts (analyses_fts, rowid, text, summary, translation)
+    VALUES ('delete', old.id, old.text, old.summary, old.translation);
+    INSERT INTO analyses_fts (rowid, text, summary, translation)
+    VALUES (new.id, new.text, new.summary, new.translation);
+END;
+"""
+
+UPSERT = """
+INSERT INTO analyses (
+    content_hash, target_lang, model, text, lang, lang_name, lang_score,
+    summary, sentiment_label, sentiment_json, translation, created_at
+) VALUES (
+    :content_hash, :target_lang, :model, :text, :lang, :lang_name, :lang_score,
+    :summary, :sentiment_label, :sentiment_json, :translation, :created_at
+)
+ON CONFLICT (content_hash, target_lang, model) DO UPDATE SET
+    lang = excluded.lang,
+    lang_name = excluded.lang_name,
+    lang_score = excluded.lang_score,
+    summary = excluded.summary,
+    sentiment_label = excluded.sentiment_label,
+    sentiment_json = excluded.sentiment_json,
+    translation = excluded.translation,
+    created_at = excluded.created_at
+"""
+
+SELECT_ID = "SELECT id FROM analyses WHERE content_hash = ? AND target_lang = ? AND model = ?"
+
+LINK_URL = "INSERT OR IGNORE INTO analysis_urls (url, analysis_id) VALUES (?, ?)"
+
+# Most recently linked URL for an analysis, for display in search results.
+URL_COLUMN = "(SELECT u.url FROM analysis_urls u WHERE u.analysis_id = a.id ORDER BY u.rowid DESC LIMIT 1) AS url"
+
+
+def content_hash(text: str) -> str:
+    """
+    SHA-256 of the whitespace-normalised text, so re-fetches that only differ
+    in spacing map to the same stored analysis.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _fts_query(query: str) -> str:
+    """
+    Quote every term so user input can't trip FTS5 query syntax
+    (e.g. hyphens, colons or stray quotes). Terms are AND-ed.
+    """
+    terms = [t.replace('"', '""') for t in query.split()]
+    return " ".join(f'"{t}"' for t in terms if t)
+
+
+class AnalysisStore:
+    """
+    SQLite-backed store of past analyses with an FTS5 index over the
+    original text, summary and translation.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per call keeps this safe across Streamlit's script threads.
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    # ---------- Writes ----------
+
+    def save(self, text: str, results: Dict, target_lang: str, model: str = None, url: str = None) -> str:
+        """
+        Store a single analysis. Returns its content hash.
+        """
+        record = {"text": text, "results": results, "target_lang": target_lang, "model": model, "url": url}
+        return self.save_many([record])[0]
+
+    def save_many(self, records: Iterable[Dict]) -> List[str]:
+        """
+        Store many analyses in one transaction, replacing any earlier result for
+        the same content, target language and model.
+        Each record is a dict with keys: text, results, target_lang, and optionally model, url.
+        Returns the content hashes in input order.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        records = list(records)
+        rows = [self._to_row(r, now) for r in records]
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.executemany(UPSERT, rows)
+                links = []
+                for record, row in zip(records, rows):
+                    if record.get("url"):
+                        analysis_id = conn.execute(
+                            SELECT_ID, (row["content_hash"], row["target_lang"], row["model"])
+                        ).fetchone()[0]
+                        links.append((record["url"], analysis_id))
+                conn.executemany(LINK_URL, links)
+        return [r["content_hash"] for r in rows]
+
+    def add_url(self, url: str, digest: str, target_lang: str, model: str = None) -> bool:
+        """
+        Link another URL to an already-stored analysis so later visits hit get_by_url().
+        Returns False if no such analysis exists.
+        """
+        with closing(self._connect()) as conn:
+            with conn:
+                row = conn.execute(SELECT_ID, (digest, target_lang, model or "")).fetchone()
+                if row is None:
+                    return False
+                conn.execute(LINK_URL, (url, row[0]))
+        return True
+
+    @staticmethod
+    def _to_row(record: Dict, now: str) -> Dict:
+        results = record.get("results", {})
+        det = results.get("detection") or {}
+        sent = results.get("sentiment")
+        return {
+            "content_hash": content_hash(record["text"]),
+            "target_lang": record["target_lang"],
+            "model": record.get("model") or "",
+            "text": record["text"],
+            "lang": det.get("lang"),
+            "lang_name": det.get("name"),
+            "lang_score": det.get("score"),
+            "summary": results.get("summary"),
+            "sentiment_label": (str(sent.get("label")).lower() if isinstance(sent, dict) and sent.get("label") else None),
+            "sentiment_json": (json.dumps(sent) if sent is not None else None),
+            "translation": results.get("translation"),
+            "created_at": now,
+        }
+
+    # ---------- Lookups ----------
+
+    def get_by_url(self, url: str, target_lang: str, model: str = None) -> Optional[Dict]:
+        """
+        Most recent analysis stored for this URL, target language and model, or None.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT a.*, u.url AS url FROM analysis_urls u JOIN analyses a ON a.id = u.analysis_id "
+                "WHERE u.url = ? AND a.target_lang = ? AND a.model = ? "
+                "ORDER BY a.created_at DESC, a.id DESC LIMIT 1",
+                (url, target_lang, model or ""),
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def get_by_hash(self, digest: str, target_lang: str, model: str = None) -> Optional[Dict]:
+        """
+        Analysis stored for this content hash, target language and model, or None.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT a.*, {URL_COLUMN} FROM analyses a "
+                "WHERE a.content_hash = ? AND a.target_lang = ? AND a.model = ?",
+                (digest, target_lang, model or ""),
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    @staticmethod
+    def _filters(query: str, lang: str, sentiment: str) -> Tuple[str, str, List]:
+        """
+        Build the FROM and WHERE clauses shared by search() and count().
+        """
+        where, params = [], []
+        fts = _fts_query(query or "")
+        if fts:
+            where.append("analyses_fts MATCH ?")
+            params.append(fts)
+        if lang:
+            where.append("a.lang = ?")
+            params.append(lang)
+        if sentiment:
+            where.append("a.sentiment_label = ?")
+            params.append(sentiment)
+
+        if fts:
+            source = "analyses_fts JOIN analyses a ON a.id = analyses_fts.rowid"
+        else:
+            source = "analyses a"
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        return source, where_sql, params
+
+    def search(
+        self,
+        query: str = "",
+        lang: str = None,
+        sentiment: str = None,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> List[Dict]:
+        """
+        Full-text search over stored analyses, optionally filtered by detected
+        language code and sentiment label. Results are ranked by relevance and
+        carry a highlighted snippet when a query is given, otherwise newest first
+        with no snippet.
+        """
+        source, where_sql, params = self._filters(query, lang, sentiment)
+        if _fts_query(query or ""):
+            snippet = "snippet(analyses_fts, -1, '**', '**', ' … ', 24)"
+            order = "bm25(analyses_fts)"
+        else:
+            snippet = "NULL"
+            order = "a.created_at DESC, a.id DESC"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT a.*, {URL_COLUMN}, {snippet} AS snippet FROM {source} {where_sql} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    def count(self, query: str = "", lang: str = None, sentiment: str = None) -> int:
+        """
+        Number of stored analyses matching the same query and filters as search().
+        """
+        source, where_sql, params = self._filters(query, lang, sentiment)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {source} {where_sql}", params).fetchone()[0]
+
+    def facets(self) -> Dict[str, List[str]]:
+        """
+        Distinct language codes and sentiment labels present in the store, for filter widgets.
+        """
+        with closing(self._connect()) as conn:
+            langs = [r[0] for r in conn.execute(
+                "SELECT DISTINCT lang FROM analyses WHERE lang IS NOT NULL ORDER BY lang")]
+            sentiments = [r[0] for r in conn.execute(
+                "SELECT DISTINCT sentiment_label FROM analyses WHERE sentiment_label IS NOT NULL ORDER BY sentiment_label")]
+        return {"lang": langs, "sentiment": sentiments}
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict:
+        """
+        Rebuild a record shaped like run_full_analysis() output, plus stored metadata.
+        """
+        keys = row.keys()
+        results = {"detection": {"lang": row["lang"], "name": row["lang_name"], "score": row["lang_score"] or 0.0}}
+        if row["summary"] is not None:
+            results["summary"] = row["summary"]
+        if row["sentiment_json"] is not None:
+            results["sentiment"] = json.loads(row["sentiment_json"])
+        if row["translation"] is not None:
+            results["translation"] = row["translation"]
+        return {
+            "url": row["url"] if "url" in keys else None,
+            "content_hash": row["content_hash"],
+            "target_lang": row["target_lang"],
+            "model": row["model"] or None,
+            "text": row["text"],
+            "created_at": row["created_at"],
+            "results": results,
+            "snippet": row["snippet"] if "snippet" in keys else None,
+        }
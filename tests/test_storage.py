@@ -0,0 +1,90 @@
+import pytest
+
+from src.storage import AnalysisStore, content_hash
+
+RESULTS = {
+    "detection": {"lang": "en", "name": "English", "score": 0.99},
+    "summary": "Markets rallied on strong earnings.",
+    "sentiment": {"label": "Positive", "score": 0.6},
+    "translation": "The stock market rose sharply today.",
+}
+TEXT = "The stock market rose sharply today after strong earnings reports."
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnalysisStore(str(tmp_path / "analyses.db"))
+
+
+def test_save_and_get_round_trip(store):
+    digest = store.save(TEXT, RESULTS, "en", model="llama-3.1-8b-instant", url="http://a")
+
+    assert digest == content_hash(TEXT)
+    stored = store.get_by_url("http://a", "en", model="llama-3.1-8b-instant")
+    assert stored["text"] == TEXT
+    assert stored["results"]["summary"] == RESULTS["summary"]
+    assert stored["results"]["sentiment"] == RESULTS["sentiment"]
+    assert store.get_by_hash(digest, "en", model="llama-3.1-8b-instant")["url"] == "http://a"
+
+
+def test_same_content_under_two_urls(store):
+    store.save(TEXT, RESULTS, "en", model="m", url="http://a")
+    store.save(TEXT, RESULTS, "en", model="m", url="http://b")
+
+    assert store.get_by_url("http://a", "en", model="m") is not None
+    assert store.get_by_url("http://b", "en", model="m") is not None
+    assert store.count() == 1
+
+
+def test_add_url_links_existing_analysis(store):
+    digest = store.save(TEXT, RESULTS, "en", model="m", url="http://a")
+
+    assert store.add_url("http://mirror", digest, "en", model="m")
+    assert store.get_by_url("http://mirror", "en", model="m")["content_hash"] == digest
+    assert not store.add_url("http://other", "missing", "en", model="m")
+
+
+def test_lookup_is_per_model_and_target_lang(store):
+    store.save(TEXT, RESULTS, "en", model="small", url="http://a")
+
+    assert store.get_by_url("http://a", "en", model="large") is None
+    assert store.get_by_url("http://a", "fr", model="small") is None
+
+
+def test_resave_replaces_result(store):
+    store.save(TEXT, RESULTS, "en", model="m", url="http://a")
+    store.save(TEXT, {**RESULTS, "summary": "Updated summary."}, "en", model="m", url="http://a")
+
+    assert store.get_by_url("http://a", "en", model="m")["results"]["summary"] == "Updated summary."
+    assert store.search("updated")[0]["content_hash"] == content_hash(TEXT)
+    assert store.count("rallied") == 0
+
+
+def test_search_filters_and_pagination(store):
+    negative = {**RESULTS, "sentiment": {"label": "negative", "score": -0.8}}
+    french = {**RESULTS, "detection": {"lang": "fr", "name": "French", "score": 0.9}}
+    store.save_many([
+        {"text": TEXT, "results": RESULTS, "target_lang": "en"},
+        {"text": "A severe storm hit the coast overnight.", "results": negative, "target_lang": "en"},
+        {"text": "Le marché boursier a fortement progressé.", "results": french, "target_lang": "en"},
+    ])
+
+    assert store.count() == 3
+    assert store.count(sentiment="negative") == 1
+    assert store.count(lang="fr") == 1
+    assert store.count("storm") == 1
+    assert "**storm**" in store.search("storm")[0]["snippet"]
+    assert store.search()[0]["snippet"] is None
+    assert len(store.search(limit=2)) == 2
+    assert len(store.search(limit=2, offset=2)) == 1
+    assert store.facets() == {"lang": ["en", "fr"], "sentiment": ["negative", "positive"]}
+
+
+def test_search_escapes_fts_syntax(store):
+    store.save(TEXT, RESULTS, "en")
+
+    # Punctuation is treated as literal text rather than FTS5 operators.
+    assert store.count('stock-market "today') == 1
+    assert store.count("market: today") == 1
+    assert store.count("market AND NOT today") == 0
+